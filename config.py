@@ -36,7 +36,7 @@ except FileNotFoundError:
             'max_price': 1500.0,
             'enable_max_price_limit': True
         },
-        'paths': {'stock_list_file': 'stock_list.csv', 'valid_stock_list_file': 'valid_stock_list.csv', 'output_dir': 'outputs', 'report_dir': 'outputs/reports', 'token_store_file': 'token_store.json'},
+        'paths': {'stock_list_file': 'stock_list.csv', 'valid_stock_list_file': 'valid_stock_list.csv', 'output_dir': 'outputs', 'report_dir': 'outputs/reports', 'token_store_file': 'token_store.json', 'validation_cache_file': 'outputs/isin_validation_cache.json'},
         'reporting': {'max_reports': 2},
         'upstox': {'api_version': 'v2'}
     }
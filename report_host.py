@@ -1,9 +1,12 @@
 import os
-import shutil
+import re
+import shlex
+import stat
 import subprocess
 from datetime import datetime
 from utils.helpers import logging  # Uses existing logging setup
 import glob
+from heapq import nlargest
 import config
 
 # Define project root as the directory that contains this file.
@@ -15,33 +18,155 @@ TARGET_FILENAME = "index.html"
 TARGET_FILEPATH = os.path.join(DOCS_DIR, TARGET_FILENAME)
 TARGET_FAILURE_FILENAME = "failure-report.html"
 TARGET_FAILURE_FILEPATH = os.path.join(DOCS_DIR, TARGET_FAILURE_FILENAME)
+# Matches daily report filenames, capturing the report kind and the YYYYMMDD trading date
+_REPORT_FILENAME_RE = re.compile(r'(success|failure)_report_(\d{8})\.html')
+COPY_BUFFER_SIZE = 1 << 20  # 1 MiB buffer for the user-space copy fallback
+
+def _parse_yyyymmdd(day):
+    """Parses a 'YYYYMMDD' string into a datetime without going through strptime."""
+    return datetime(int(day[:4]), int(day[4:6]), int(day[6:8]))
 
 def run_git_command(command_list, cwd=PROJECT_ROOT):
-    """Run a git command using subprocess and log the output."""
+    """Run a git command using subprocess and log its stderr (stdout is discarded)."""
     try:
-        logging.info(f"Running command: {' '.join(command_list)}")
-        result = subprocess.run(command_list, cwd=cwd, capture_output=True, text=True, check=True)
-        logging.info(result.stdout)
+        logging.info(f"Running command: {shlex.join(command_list)}")
+        result = subprocess.run(command_list, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
         if result.stderr:
             logging.warning(result.stderr)
         return True
+    except subprocess.CalledProcessError as e:
+        logging.error(f"Git command failed: {e}\n{e.stderr}")
+        return False
     except Exception as e:
         logging.error(f"Git command failed: {e}")
         return False
 
-def sync_reports_to_docs():
+def _list_report_html(report_dir):
+    """Returns the names of the HTML files in report_dir using a single directory scan."""
+    try:
+        with os.scandir(report_dir) as entries:
+            return [entry.name for entry in entries if entry.name.endswith('.html') and not entry.name.startswith('.')]
+    except FileNotFoundError:
+        logging.warning(f"Report directory not found: {report_dir}")
+        return []
+
+def _git_output(command_list, cwd=PROJECT_ROOT):
+    """Run a read-only git command and return its stdout, or None if it fails."""
+    try:
+        result = subprocess.run(command_list, cwd=cwd, capture_output=True, text=True, check=True)
+        return result.stdout
+    except Exception as e:
+        logging.warning(f"Git command failed: {shlex.join(command_list)}: {e}")
+        return None
+
+def _docs_git_state():
+    """
+    Reads the docs folder's git state with a single `git status --porcelain --branch` call.
+
+    Returns:
+        tuple | None: (has_uncommitted_changes, branch_is_ahead_of_upstream), or None if git
+                      state could not be read. The branch is never "ahead" without an upstream.
+    """
+    docs_path = os.path.relpath(DOCS_DIR, PROJECT_ROOT)
+    output = _git_output(["git", "status", "--porcelain", "--branch", "--", docs_path])
+    if output is None:
+        return None
+    lines = output.splitlines()
+    # The header looks like "## main...origin/main [ahead 1]"; the other lines are changed docs files
+    header = lines[0] if lines and lines[0].startswith("## ") else ""
+    has_changes = len(lines) > (1 if header else 0)
+    is_ahead = "[ahead " in header
+    return has_changes, is_ahead
+
+def _docs_commits_unpushed():
+    """Returns True if any commit touching the docs folder has not been pushed to the upstream branch."""
+    docs_path = os.path.relpath(DOCS_DIR, PROJECT_ROOT)
+    output = _git_output(["git", "rev-list", "-1", "@{upstream}..HEAD", "--", docs_path])
+    return output is None or bool(output.strip())
+
+def sync_reports_to_docs(report_names=None):
     """
     Copies all daily report HTML files from the reports folder (config.settings['paths']['report_dir'])
     into the docs folder, so that GitHub Pages serves these reports.
+    Reports whose docs copy is already up to date are skipped, so each run only
+    copies the new or regenerated reports instead of the whole archive.
+
+    Args:
+        report_names (list, optional): HTML file names in the reports folder, as returned by
+                                       _list_report_html. Scanned here if not provided.
+
+    Returns:
+        int: The number of report files copied.
     """
     report_dir = config.settings['paths']['report_dir']
-    for html_file in glob.glob(os.path.join(report_dir, "*.html")):
-        dest_file = os.path.join(DOCS_DIR, os.path.basename(html_file))
+    if report_names is None:
+        report_names = _list_report_html(report_dir)
+    copied = 0
+    for name in report_names:
+        html_file = os.path.join(report_dir, name)
+        dest_file = os.path.join(DOCS_DIR, name)
         try:
-            shutil.copyfile(html_file, dest_file)
+            if _is_up_to_date(html_file, dest_file):
+                logging.debug(f"Skipping {html_file}; docs copy is up to date")
+                continue
+            _copy_file(html_file, dest_file)
+            copied += 1
             logging.info(f"Synced {html_file} to {dest_file}")
         except Exception as e:
             logging.error(f"Error syncing report {html_file} to docs: {e}")
+    return copied
+
+def _copy_file(src, dst):
+    """
+    Copies src to dst inside the kernel where possible.
+    Tries os.copy_file_range (Linux, may reflink on CoW filesystems), then os.sendfile,
+    and falls back to a buffered readinto loop if neither is available or supported.
+    """
+    src_fd = os.open(src, os.O_RDONLY)
+    try:
+        src_stat = os.fstat(src_fd)
+        # O_RDONLY also opens directories; refuse before dst is created or truncated
+        if not stat.S_ISREG(src_stat.st_mode):
+            raise OSError(f"Not a regular file: {src}")
+        size = src_stat.st_size
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            for copy_fn in (getattr(os, 'copy_file_range', None), getattr(os, 'sendfile', None)):
+                if copy_fn is None:
+                    continue
+                try:
+                    offset = 0
+                    while offset < size:
+                        if copy_fn is os.sendfile:
+                            sent = os.sendfile(dst_fd, src_fd, offset, size - offset)
+                        else:
+                            sent = os.copy_file_range(src_fd, dst_fd, size - offset, offset, offset)
+                        if sent == 0:
+                            break
+                        offset += sent
+                    if offset == size:
+                        return
+                except OSError as e:
+                    logging.debug(f"{copy_fn.__name__} failed for {src}, trying next method: {e}")
+                # Reset the destination before trying the next method
+                os.ftruncate(dst_fd, 0)
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+    buf = memoryview(bytearray(COPY_BUFFER_SIZE))
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        while n := fsrc.readinto(buf):
+            fdst.write(buf[:n])
+
+def _is_up_to_date(src, dst):
+    """Returns True if dst exists, has the same size as src and is not older than it."""
+    try:
+        dst_stat = os.stat(dst)
+    except FileNotFoundError:
+        return False
+    src_stat = os.stat(src)
+    return dst_stat.st_size == src_stat.st_size and dst_stat.st_mtime >= src_stat.st_mtime
 
 def publish_both_reports(success_filepath, failure_filepath):
     """
@@ -51,15 +176,32 @@ def publish_both_reports(success_filepath, failure_filepath):
     """
     # Removed code that copied success_filepath to TARGET_FILEPATH and failure_filepath to TARGET_FAILURE_FILEPATH.
     # Instead, we simply sync and update landing page.
-    sync_reports_to_docs()
-    update_landing_page()
-    
+    # List the reports folder once and share it between the sync and the landing page
+    report_names = _list_report_html(config.settings['paths']['report_dir'])
+    copied = sync_reports_to_docs(report_names)
+    landing_changed = update_landing_page(report_names)
+    # When docs changed on disk, or git state cannot be read, go straight to the full add/commit/push below
+    git_state = None if copied or landing_changed else _docs_git_state()
+    has_uncommitted_docs, is_ahead = git_state if git_state is not None else (True, False)
+    if not has_uncommitted_docs:
+        # Nothing new to commit, but a previous run's push of the docs commit may have failed
+        if is_ahead and _docs_commits_unpushed():
+            logging.info("No new reports, but an earlier reports commit is not pushed yet. Retrying git push.")
+            if run_git_command(["git", "push"]):
+                logging.info("Reports published successfully via GitHub Pages.")
+            else:
+                logging.error("Git push failed for reports.")
+        else:
+            logging.info("No new reports and docs already published. Skipping git commit/push.")
+        return
+
     # After syncing, commit & push updated docs content.
     synced_files = glob.glob(os.path.join(DOCS_DIR, "*.html"))
     files_to_commit = [os.path.relpath(f, PROJECT_ROOT) for f in synced_files]
     commit_message = f"Update GitHub Pages reports: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-    if run_git_command(["git", "add"] + files_to_commit):
-        if run_git_command(["git", "commit", "-m", commit_message]):
+    if run_git_command(["git", "add", "--"] + files_to_commit):
+        # Limit the commit to the docs files so unrelated staged changes are left alone
+        if run_git_command(["git", "commit", "-m", commit_message, "--"] + files_to_commit):
             if run_git_command(["git", "push"]):
                 logging.info("Reports published successfully via GitHub Pages in a single commit.")
             else:
@@ -69,65 +211,8 @@ def publish_both_reports(success_filepath, failure_filepath):
     else:
         logging.error("Git add failed for reports.")
 
-def update_landing_page():
-    """
-    Creates/updates index.html as a landing page.
-    It scans for both success and failure report files named as success_report_YYYYMMDD.html
-    and failure_report_YYYYMMDD.html respectively.
-    It displays two sections:
-      - Latest 5 Trading Days Success Reports
-      - Latest 5 Trading Days Failure Reports
-    Each link is built using the trading date parsed from the filename.
-    """
-    report_dir = config.settings['paths']['report_dir']
-    
-    # Process Success Reports
-    success_files = glob.glob(os.path.join(report_dir, "success_report_????????.html"))
-    daily_success = {}
-    for filepath in success_files:
-        # Filename example: success_report_20250430.html
-        basename = os.path.basename(filepath)
-        try:
-            trading_date = basename.split('_')[2].split('.')[0]  # e.g. "20250430"
-            daily_success[trading_date] = filepath  # Later runs overwrite earlier ones.
-        except Exception as e:
-            logging.warning(f"Could not parse trading date from filename {basename}: {e}")
-            continue
-    sorted_success = sorted(daily_success.keys(), reverse=True)[:5]
-    success_links_html = ""
-    for day in sorted_success:
-        report_file = os.path.basename(daily_success[day])
-        try:
-            trading_date_obj = datetime.strptime(day, "%Y%m%d")
-            link_text = trading_date_obj.strftime("%d %b %Y")
-        except Exception as e:
-            link_text = day
-        success_links_html += f'<li><a href="{report_file}">{link_text} Success Report</a></li>\n'
-    
-    # Process Failure Reports
-    failure_files = glob.glob(os.path.join(report_dir, "failure_report_????????.html"))
-    daily_failure = {}
-    for filepath in failure_files:
-        # Filename example: failure_report_20250430.html
-        basename = os.path.basename(filepath)
-        try:
-            trading_date = basename.split('_')[2].split('.')[0]
-            daily_failure[trading_date] = filepath
-        except Exception as e:
-            logging.warning(f"Could not parse trading date from filename {basename}: {e}")
-            continue
-    sorted_failure = sorted(daily_failure.keys(), reverse=True)[:5]
-    failure_links_html = ""
-    for day in sorted_failure:
-        report_file = os.path.basename(daily_failure[day])
-        try:
-            trading_date_obj = datetime.strptime(day, "%Y%m%d")
-            link_text = trading_date_obj.strftime("%d %b %Y")
-        except Exception as e:
-            link_text = day
-        failure_links_html += f'<li><a href="{report_file}">{link_text} Failure Report</a></li>\n'
-    
-    landing_html = f"""<!DOCTYPE html>
+# Landing page HTML, rendered with str.format (literal braces are doubled)
+_LANDING_TEMPLATE = """<!DOCTYPE html>
 <html lang="en">
 <head>
   <meta charset="UTF-8">
@@ -149,23 +234,100 @@ def update_landing_page():
     <div class="section">
       <h2>Latest 5 Trading Days Success Reports</h2>
       <ul>
-        {success_links_html if success_links_html else "<li>No Success Reports Available</li>"}
+        {success_links_html}
       </ul>
     </div>
     <div class="section">
       <h2>Latest 5 Trading Days Failure Reports</h2>
       <ul>
-        {failure_links_html if failure_links_html else "<li>No Failure Reports Available</li>"}
+        {failure_links_html}
       </ul>
     </div>
   </div>
 </body>
 </html>"""
+
+def update_landing_page(report_names=None):
+    """
+    Creates/updates index.html as a landing page.
+    It scans for both success and failure report files named as success_report_YYYYMMDD.html
+    and failure_report_YYYYMMDD.html respectively.
+    It displays two sections:
+      - Latest 5 Trading Days Success Reports
+      - Latest 5 Trading Days Failure Reports
+    Each link is built using the trading date parsed from the filename.
+
+    Args:
+        report_names (list, optional): HTML file names in the reports folder, as returned by
+                                       _list_report_html. Scanned here if not provided.
+
+    Returns:
+        bool: True if index.html was written, False if its content was already up to date.
+    """
+    report_dir = config.settings['paths']['report_dir']
+    
+    if report_names is None:
+        report_names = _list_report_html(report_dir)
+
+    # Bucket success and failure reports by trading date.
+    # Filename examples: success_report_20250430.html, failure_report_20250430.html
+    daily_success = {}
+    daily_failure = {}
+    for name in report_names:
+        match = _REPORT_FILENAME_RE.fullmatch(name)
+        if not match:
+            continue
+        kind, trading_date = match.groups()  # e.g. ("success", "20250430")
+        if kind == 'success':
+            daily_success[trading_date] = name
+        else:
+            daily_failure[trading_date] = name
+    sorted_success = nlargest(5, daily_success)  # Zero-padded YYYYMMDD sorts lexicographically
+    success_parts = []
+    for day in sorted_success:
+        report_file = daily_success[day]
+        try:
+            trading_date_obj = _parse_yyyymmdd(day)
+            link_text = trading_date_obj.strftime("%d %b %Y")
+        except ValueError:
+            link_text = day
+        success_parts.append(f'<li><a href="{report_file}">{link_text} Success Report</a></li>')
+    success_links_html = '\n'.join(success_parts) or '<li>No Success Reports Available</li>'
+    
+    sorted_failure = nlargest(5, daily_failure)
+    failure_parts = []
+    for day in sorted_failure:
+        report_file = daily_failure[day]
+        try:
+            trading_date_obj = _parse_yyyymmdd(day)
+            link_text = trading_date_obj.strftime("%d %b %Y")
+        except ValueError:
+            link_text = day
+        failure_parts.append(f'<li><a href="{report_file}">{link_text} Failure Report</a></li>')
+    failure_links_html = '\n'.join(failure_parts) or '<li>No Failure Reports Available</li>'
+    
+    landing_html = _LANDING_TEMPLATE.format(
+        success_links_html=success_links_html,
+        failure_links_html=failure_links_html,
+    )
     # Replace destination so that the landing page is created in docs folder, not the reports folder:
     index_filepath = os.path.join(DOCS_DIR, "index.html")
-    with open(index_filepath, "w", encoding="utf-8") as f:
-        f.write(landing_html)
+    new_content = landing_html.encode("utf-8")
+    try:
+        with open(index_filepath, "rb") as f:
+            if f.read() == new_content:
+                logging.info(f"Landing page unchanged at: {index_filepath}")
+                return False
+    except FileNotFoundError:
+        pass
+
+    # Write to a temp file and swap it in so a partially written index.html is never served
+    tmp_filepath = index_filepath + ".tmp"
+    with open(tmp_filepath, "wb") as f:
+        f.write(new_content)
+    os.replace(tmp_filepath, index_filepath)
     logging.info(f"Landing page updated at: {index_filepath}")
+    return True
 
 if __name__ == "__main__":
     import sys
@@ -15,13 +15,16 @@ project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
 import requests # Ensure requests is imported
+from requests.adapters import HTTPAdapter # For connection pooling
 from datetime import datetime, timedelta, timezone # Import timezone
 import time
 import json # Import json for discord payload
 import pytz # Import pytz for IST conversion
 import csv # Import csv module
+from collections import namedtuple
 from concurrent.futures import ThreadPoolExecutor, as_completed  # NEW import
 import signal  # Add signal module for better interrupt handling
+import threading
 
 # Import necessary functions from our modules
 import config
@@ -32,28 +35,111 @@ from utils.helpers import load_stock_list, logging # Import from helpers
 # Assume NSE Equity for constructing the key. Modify if needed.
 EXCHANGE = "NSE"
 INSTRUMENT_TYPE = "EQ"
-VALIDATION_INTERVAL = "1minute" # Use a small interval for quick check
+_KEY_PREFIX = sys.intern(f"{EXCHANGE}_{INSTRUMENT_TYPE}|") # e.g. 'NSE_EQ|', prepended to each ISIN
+VALIDATION_INTERVAL = "day" # Daily candles keep the response to a couple of rows; only the status is checked
 VALIDATION_DAYS_BACK = 2 # Check data for the last couple of days
+VALIDATION_CACHE_TTL_DAYS = 7 # Re-check ISINs that were last validated longer ago than this
+VALIDATION_MAX_WORKERS = 32 # Max requests in flight at once (I/O bound, so threads mostly wait)
+HTTP_POOL_SIZE = VALIDATION_MAX_WORKERS # One keep-alive connection per worker
+VALIDATION_MAX_REQUESTS_PER_SECOND = 20 # Paces all workers together, below the API's 25 req/s limit
+
+# Shared session so TCP/TLS connections are reused across requests (Upstox API and Discord webhook).
+# urllib3 connection pools are thread-safe, so all worker threads can use it.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=0))
+
+# Shared request pacing and rate-limit backoff. Every request takes the next free slot, spaced
+# 1/VALIDATION_MAX_REQUESTS_PER_SECOND apart. A 429 pushes the slots back past a shared deadline, so
+# after a backoff the workers resume one slot apart instead of all at the same instant.
+RATE_LIMIT_DEFAULT_WAIT = 3 # Seconds to back off when the API sends no usable Retry-After
+RATE_LIMIT_MAX_WAIT = 60 # Upper bound on a server-requested backoff, so the run never looks hung
+RATE_LIMIT_MAX_RETRIES = 5 # 429 retries per key before it is reported as unchecked (not invalid)
+_rate_limit_until = 0.0
+_next_request_at = 0.0 # Earliest monotonic time the next paced request may be sent
+_rate_limit_lock = threading.Lock()
+
+# Lightweight record for validation results (cheaper than a dict per stock)
+Stock = namedtuple('Stock', ['symbol', 'isin'])
 
 # --- Helper Functions ---
 
-def validate_instrument_key(instrument_key, headers):
+def _acquire_request_slot():
+    """
+    Blocks until this worker may send its next request. Requests from all workers are paced to
+    VALIDATION_MAX_REQUESTS_PER_SECOND and held back until any rate-limit backoff has expired.
+    """
+    global _next_request_at
+    while True:
+        with _rate_limit_lock:
+            slot = max(time.monotonic(), _next_request_at, _rate_limit_until)
+            _next_request_at = slot + 1.0 / VALIDATION_MAX_REQUESTS_PER_SECOND
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        # A 429 may have started a backoff while we slept; if so, queue up again behind it
+        if time.monotonic() >= _rate_limit_until:
+            return
+
+def _set_rate_limit(retry_after):
+    """
+    Extends the shared backoff after a 429 response.
+
+    Args:
+        retry_after (str | None): The response's Retry-After header value, in seconds.
+                                  Capped at RATE_LIMIT_MAX_WAIT.
+
+    Returns:
+        float: The number of seconds until the shared backoff expires. This can be longer than
+               Retry-After if another worker already set a later deadline.
+    """
+    global _rate_limit_until
+    try:
+        wait_seconds = max(float(retry_after), 0.0)
+    except (TypeError, ValueError):
+        wait_seconds = RATE_LIMIT_DEFAULT_WAIT
+    if wait_seconds > RATE_LIMIT_MAX_WAIT:
+        logging.warning(f"Retry-After of {wait_seconds:g}s exceeds the {RATE_LIMIT_MAX_WAIT}s limit; backing off for {RATE_LIMIT_MAX_WAIT}s instead.")
+        wait_seconds = RATE_LIMIT_MAX_WAIT
+    with _rate_limit_lock:
+        now = time.monotonic()
+        _rate_limit_until = max(_rate_limit_until, now + wait_seconds)
+        return _rate_limit_until - now
+
+def _get_with_rate_limit(url, headers):
+    """
+    Sends a paced GET request, waiting out and retrying 429 responses.
+
+    Returns:
+        requests.Response: The first non-429 response, or the last 429 response if
+                           RATE_LIMIT_MAX_RETRIES retries were all rate limited.
+    """
+    for retry in range(RATE_LIMIT_MAX_RETRIES + 1):
+        _acquire_request_slot()
+        response = _SESSION.get(url, headers=headers, timeout=10)
+        if response.status_code != 429:
+            return response
+        wait_seconds = _set_rate_limit(response.headers.get('Retry-After'))
+        if retry < RATE_LIMIT_MAX_RETRIES:
+            logging.warning(f"Rate limit hit (HTTP 429). Retrying after {wait_seconds:.1f} seconds...")
+    return response
+
+def validate_instrument_key(instrument_key, headers, to_date, from_date):
     """
     Attempts to fetch minimal historical data to validate an instrument key.
 
     Args:
         instrument_key (str): The Upstox instrument key (e.g., 'NSE_EQ|INE002A01018').
         headers (dict): The authentication headers for the API request.
+        to_date (str): End of the validation window, formatted 'YYYY-MM-DD'.
+        from_date (str): Start of the validation window, formatted 'YYYY-MM-DD'.
 
     Returns:
-        bool: True if the key seems valid (API returns success), False otherwise.
+        bool | None: True if the key seems valid (API returns success), False if it is invalid,
+                     or None if it could not be checked because the API kept rate limiting us.
     """
-    # Use a very small date range for validation
-    to_date = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d') # Yesterday
-    from_date = (datetime.now() - timedelta(days=VALIDATION_DAYS_BACK)).strftime('%Y-%m-%d')
-
-    # URL Encode the instrument key for safety
-    encoded_instrument_key = requests.utils.quote(instrument_key)
+    # URL encode the instrument key. Keys look like 'NSE_EQ|<ISIN>' and ISINs are
+    # alphanumeric, so the '|' separator is the only character that needs escaping.
+    encoded_instrument_key = instrument_key.replace('|', '%7C')
 
     # Construct URL based on historical data endpoint structure
     url = f"https://api.upstox.com/{API_VERSION}/historical-candle/{encoded_instrument_key}/{VALIDATION_INTERVAL}/{to_date}/{from_date}"
@@ -61,7 +147,7 @@ def validate_instrument_key(instrument_key, headers):
 
     for attempt in range(2):  # Try twice
         try:
-            response = requests.get(url, headers=headers, timeout=10)
+            response = _get_with_rate_limit(url, headers)
             
             if response.status_code == 200:
                 data = response.json()
@@ -76,13 +162,9 @@ def validate_instrument_key(instrument_key, headers):
                         continue
                     return False
                     
-            elif response.status_code == 429:  # Rate limit hit
-                logging.warning(f"Rate limit hit for {instrument_key}. HTTP Status: 429.")
-                if attempt == 0:  # Only retry on first attempt
-                    logging.info(f"Retrying {instrument_key} after 3 seconds...")
-                    time.sleep(3)  # Increased from 1 to 3 seconds
-                    continue
-                return False
+            elif response.status_code == 429:  # Still rate limited after all retries
+                logging.warning(f"Could not check {instrument_key}: still rate limited after {RATE_LIMIT_MAX_RETRIES} retries.")
+                return None  # Unchecked, not invalid
                 
             elif response.status_code == 404:
                 logging.warning(f"Validation failed for {instrument_key}. HTTP Status: 404 (Not Found)")
@@ -123,8 +205,59 @@ def validate_instrument_key(instrument_key, headers):
             
     return False  # If we get here, all attempts failed
 
-def send_stocklist_to_discord(valid_stocks, invalid_stocks, total_checked, duration_seconds, webhook_url):
-    """Sends a summary of validation results (valid count, invalid list) to Discord."""
+def _discord_rate_limit_wait(response_headers, default):
+    """
+    Returns how long to wait before the next webhook call, based on Discord's rate-limit headers.
+    No wait is needed while requests remain in the current bucket; once it is exhausted we wait
+    until it resets. Falls back to `default` seconds if the headers are missing or malformed.
+    """
+    remaining = response_headers.get('X-RateLimit-Remaining')
+    reset_after = response_headers.get('X-RateLimit-Reset-After')
+    if remaining is None or reset_after is None:
+        return default
+    try:
+        return 0 if int(remaining) > 0 else float(reset_after)
+    except ValueError:
+        return default
+
+def load_validation_cache(cache_file):
+    """
+    Loads the ISIN validation cache from disk.
+
+    Args:
+        cache_file (str): Path to the JSON cache file.
+
+    Returns:
+        dict: Maps each known-valid ISIN to the date it was last validated ('YYYY-MM-DD'),
+              or an empty dict if the file is missing or unreadable.
+    """
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (IOError, json.JSONDecodeError) as e:
+        logging.warning(f"Could not read validation cache '{cache_file}', ignoring it: {e}")
+        return {}
+    if not isinstance(data, dict) or not all(isinstance(day, str) for day in data.values()):
+        logging.warning(f"Validation cache '{cache_file}' is not a mapping of ISIN to date, ignoring it.")
+        return {}
+    return data
+
+def save_validation_cache(cache_file, cache):
+    """Writes the ISIN validation cache to disk via a temp file, so a crash never leaves it truncated."""
+    tmp_file = cache_file + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_file) or '.', exist_ok=True)
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, indent=2, sort_keys=True)
+        os.replace(tmp_file, cache_file)
+        logging.info(f"Saved validation cache with {len(cache)} entries to '{cache_file}'.")
+    except (IOError, OSError) as e:
+        logging.error(f"Failed to save validation cache to '{cache_file}': {e}")
+
+def send_stocklist_to_discord(valid_stocks, invalid_stocks, total_checked, duration_seconds, webhook_url, unchecked_stocks=()):
+    """Sends a summary of validation results (valid count, invalid list, unchecked count) to Discord."""
     if not webhook_url:
         logging.warning("Discord stocklist webhook URL not configured. Skipping notification.")
         return
@@ -168,6 +301,9 @@ def send_stocklist_to_discord(valid_stocks, invalid_stocks, total_checked, durat
     elif invalid_stocks:
         color = 0xFF0000 # Red if any invalid
         summary_desc = f"Checked {total_checked} stocks. Found issues."
+    elif unchecked_stocks:
+        color = 0xFFA500 # Orange if some could not be checked
+        summary_desc = f"Checked {total_checked} stocks. Some could not be checked due to API rate limiting."
     else:
         color = 0x00FF00 # Green if all valid
         summary_desc = f"Checked {total_checked} stocks. All entries are valid."
@@ -183,41 +319,49 @@ def send_stocklist_to_discord(valid_stocks, invalid_stocks, total_checked, durat
         ],
         "footer": {"text": footer_text_common},
     }
+    if unchecked_stocks:
+        summary_embed["fields"].append({"name": "Unchecked (Rate Limited)", "value": str(len(unchecked_stocks)), "inline": True})
     embeds_to_send.append(summary_embed)
 
     # Add Invalid Stocks List (if any, potentially split)
     if invalid_stocks:
         logging.info(f"Generating embed(s) for {len(invalid_stocks)} invalid stocks list...")
         color_invalid = 0xFF0000 # Red
-        current_desc_invalid = ""
+        # Build each description as a list of lines with running length/line counters,
+        # so the split checks below are O(1) instead of rescanning the description.
+        current_lines_invalid = []
+        current_len_invalid = 0
         part_num_invalid = 1
         lines_needed_invalid = len(invalid_stocks)
         total_parts_invalid = (lines_needed_invalid + MAX_LINES_PER_DESC - 1) // MAX_LINES_PER_DESC
+        title_invalid = f"Invalid Stock List ({len(invalid_stocks)} Total)"
         # Footer only needed if this is the *only* embed (i.e., no valid stocks found previously)
         # However, the summary embed is always added first now, so invalid list never needs the main footer.
         footer_invalid = None
 
         for i, stock in enumerate(invalid_stocks):
-            line = f"{i+1}. {stock['symbol']} ({stock['isin']})\n"
-            if (len(current_desc_invalid) + len(line) > MAX_CHARS_PER_DESC and current_desc_invalid) or \
-               current_desc_invalid.count('\n') >= MAX_LINES_PER_DESC:
+            line = f"{i+1}. {stock.symbol} ({stock.isin})\n"
+            if (current_len_invalid + len(line) > MAX_CHARS_PER_DESC and current_lines_invalid) or \
+               len(current_lines_invalid) >= MAX_LINES_PER_DESC:
                 embed = {
-                    "title": f"Invalid Stock List ({len(invalid_stocks)} Total)" + (f" - Part {part_num_invalid}/{total_parts_invalid}" if total_parts_invalid > 1 else ""),
-                    "description": current_desc_invalid,
+                    "title": title_invalid + (f" - Part {part_num_invalid}/{total_parts_invalid}" if total_parts_invalid > 1 else ""),
+                    "description": "".join(current_lines_invalid),
                     "color": color_invalid,
                     # No footer needed for these parts as summary embed has it
                 }
                 embeds_to_send.append(embed)
-                current_desc_invalid = line
+                current_lines_invalid = [line]
+                current_len_invalid = len(line)
                 part_num_invalid += 1
             else:
-                current_desc_invalid += line
+                current_lines_invalid.append(line)
+                current_len_invalid += len(line)
 
         # Add the last chunk for invalid stocks
-        if current_desc_invalid:
+        if current_lines_invalid:
              embed = {
-                "title": f"Invalid Stock List ({len(invalid_stocks)} Total)" + (f" - Part {part_num_invalid}/{total_parts_invalid}" if total_parts_invalid > 1 else ""),
-                "description": current_desc_invalid,
+                "title": title_invalid + (f" - Part {part_num_invalid}/{total_parts_invalid}" if total_parts_invalid > 1 else ""),
+                "description": "".join(current_lines_invalid),
                 "color": color_invalid,
              }
              # No footer needed here either
@@ -237,21 +381,33 @@ def send_stocklist_to_discord(valid_stocks, invalid_stocks, total_checked, durat
         embed_chunk = embeds_to_send[start_index:end_index]
         if not embed_chunk: continue
         payload = {"username": username, "embeds": embed_chunk}
+        wait_seconds = 1 # Fallback gap between messages when Discord sends no rate-limit headers
         try:
-            response = requests.post(webhook_url, json=payload, timeout=15)
+            # Compact separators trim whitespace from large embed payloads
+            body = json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+            response = _SESSION.post(webhook_url, data=body, headers={'Content-Type': 'application/json'}, timeout=15)
             response.raise_for_status()
             logging.info(f"Discord embed notification sent successfully (Message {i+1}/{num_messages}).")
+            wait_seconds = _discord_rate_limit_wait(response.headers, wait_seconds)
         except requests.exceptions.RequestException as e:
             logging.error(f"Error sending Discord embed notification (Message {i+1}/{num_messages}): {e}")
             if e.response is not None: logging.error(f"Discord Response: {e.response.text}")
         except Exception as e:
              logging.error(f"Unexpected error sending Discord embed notification (Message {i+1}/{num_messages}): {e}")
-        if num_messages > 1 and i < num_messages - 1: time.sleep(1)
+        if num_messages > 1 and i < num_messages - 1 and wait_seconds > 0: time.sleep(wait_seconds)
 
 # --- Main Validation Logic ---
 
-def run_validation():
-    """Loads stocks, validates keys, sends results, and saves valid list."""
+def run_validation(force=False):
+    """
+    Loads stocks, validates keys, sends results, and saves valid list.
+
+    ISINs validated successfully within the last VALIDATION_CACHE_TTL_DAYS days are taken
+    from the on-disk cache instead of calling the API again.
+
+    Args:
+        force (bool): If True, ignore the cache and re-validate every ISIN.
+    """
     start_time = time.time() # Record start time
     logging.info("Starting ISIN validation process...")
 
@@ -270,24 +426,48 @@ def run_validation():
         return
 
     logging.info(f"Found {len(stocks)} stocks to validate.")
-    results = {'valid': [], 'invalid': []}
+
+    # Use a very small date range for validation; computed once since every stock shares it
+    now = datetime.now()
+    to_date = (now - timedelta(days=1)).strftime('%Y-%m-%d') # Yesterday
+    from_date = (now - timedelta(days=VALIDATION_DAYS_BACK)).strftime('%Y-%m-%d')
+    results = {'valid': [], 'invalid': [], 'unchecked': []}
+
+    # Load the cache of recently validated ISINs, dropping entries past the TTL
+    # Older config.yaml files have no validation_cache_file entry; default to the output folder
+    cache_file = config.settings['paths'].get(
+        'validation_cache_file',
+        os.path.join(config.settings['paths']['output_dir'], 'isin_validation_cache.json')
+    )
+    today_str = now.strftime('%Y-%m-%d')
+    cache_cutoff = (now - timedelta(days=VALIDATION_CACHE_TTL_DAYS)).strftime('%Y-%m-%d')
+    validation_cache = {} if force else load_validation_cache(cache_file)
+    validation_cache = {isin: day for isin, day in validation_cache.items() if day >= cache_cutoff}
+    cached_count = sum(1 for stock in stocks if stock['isin'] in validation_cache)
+    if cached_count:
+        logging.info(f"{cached_count} stocks were validated in the last {VALIDATION_CACHE_TTL_DAYS} days and will be skipped.")
 
     # New helper for threaded processing
     def process_stock(index, stock):
-        symbol = stock['symbol']
-        isin = stock['isin']
-        instrument_key = f"{EXCHANGE}_{INSTRUMENT_TYPE}|{isin}"
-        is_valid = validate_instrument_key(instrument_key, headers)
+        if stock['isin'] in validation_cache:
+            return index, stock, True
+        instrument_key = _KEY_PREFIX + stock['isin']
+        is_valid = validate_instrument_key(instrument_key, headers, to_date, from_date)
         # No additional delay here - validate_instrument_key already has retry logic with delays
         return index, stock, is_valid
 
     # Set up signal handler for better interrupt handling
     interrupted = False
+    futures_to_stock = {}
     def signal_handler(sig, frame):
         nonlocal interrupted
         if not interrupted:
             logging.warning("Interrupt signal received. Shutting down gracefully...")
             interrupted = True
+            # Cancel stocks that have not started yet; cancelled futures complete
+            # immediately, so the result loop below wakes up and stops promptly.
+            for future in futures_to_stock:
+                future.cancel()
         else:
             logging.warning("Second interrupt received. Forcing exit...")
             sys.exit(1)
@@ -295,14 +475,15 @@ def run_validation():
     original_handler = signal.getsignal(signal.SIGINT)
     signal.signal(signal.SIGINT, signal_handler)
 
-    # Use ThreadPoolExecutor for parallel validation with more workers
+    # Use ThreadPoolExecutor for parallel validation; concurrency is bounded by VALIDATION_MAX_WORKERS
     valid_count = 0
     invalid_count = 0
+    unchecked_count = 0
     validation_loop_start_time = time.time()
     
     # Enable catching KeyboardInterrupt during thread execution
     try:
-        with ThreadPoolExecutor(max_workers=4) as executor:  # Increased workers
+        with ThreadPoolExecutor(max_workers=VALIDATION_MAX_WORKERS) as executor:
             # Submit all jobs at once
             futures_to_stock = {
                 executor.submit(process_stock, i, stock): (i, stock) 
@@ -311,7 +492,7 @@ def run_validation():
             
             # Process completed futures as they finish
             for future in as_completed(futures_to_stock):
-                if interrupted:
+                if interrupted or future.cancelled():
                     logging.warning("Processing interrupted. Skipping remaining stocks.")
                     break
                 
@@ -320,33 +501,27 @@ def run_validation():
                     symbol = stock['symbol']
                     isin = stock['isin']
                     
-                    if is_valid:
+                    if is_valid is None:
+                        # Rate limited: keep the stock and its cache entry, it was never shown to be invalid
+                        logging.warning(f"{index+1}. [UNCHECKED] {symbol} ({isin})")
+                        unchecked_count += 1
+                        results['unchecked'].append(Stock(symbol, isin))
+                    elif is_valid:
                         logging.info(f"{index+1}. [VALID] {symbol} ({isin})")
                         valid_count += 1
-                        results['valid'].append({
-                            'symbol': symbol, 
-                            'isin': isin, 
-                            'instrument_key': f"{EXCHANGE}_{INSTRUMENT_TYPE}|{isin}"
-                        })
+                        results['valid'].append(Stock(symbol, isin))
+                        validation_cache.setdefault(isin, today_str)
                     else:
                         logging.warning(f"{index+1}. [INVALID] {symbol} ({isin})")
                         invalid_count += 1
-                        results['invalid'].append({
-                            'symbol': symbol, 
-                            'isin': isin, 
-                            'instrument_key': f"{EXCHANGE}_{INSTRUMENT_TYPE}|{isin}"
-                        })
+                        results['invalid'].append(Stock(symbol, isin))
+                        validation_cache.pop(isin, None)
                 except Exception as e:
                     # Get the original stock info from the futures mapping
                     i, stock = futures_to_stock[future]
                     logging.error(f"Error processing stock {stock['symbol']}: {e}")
                     invalid_count += 1
-                    results['invalid'].append({
-                        'symbol': stock['symbol'], 
-                        'isin': stock['isin'], 
-                        'instrument_key': f"{EXCHANGE}_{INSTRUMENT_TYPE}|{stock['isin']}",
-                        'error': str(e)
-                    })
+                    results['invalid'].append(Stock(stock['symbol'], stock['isin']))
     
     except KeyboardInterrupt:
         interrupted = True
@@ -357,7 +532,9 @@ def run_validation():
         
     if interrupted:
         logging.warning("Validation was interrupted before completion.")
-        logging.warning(f"Processed {valid_count + invalid_count} of {len(stocks)} stocks before interruption.")
+        logging.warning(f"Processed {valid_count + invalid_count + unchecked_count} of {len(stocks)} stocks before interruption.")
+
+    save_validation_cache(cache_file, validation_cache)
         
     validation_loop_end_time = time.time()
     total_duration_seconds = validation_loop_end_time - validation_loop_start_time
@@ -367,26 +544,31 @@ def run_validation():
     logging.info(f"Total Stocks Checked: {len(stocks)}")
     logging.info(f"Valid Instrument Keys: {valid_count}")
     logging.info(f"Invalid/Error Keys: {invalid_count}")
+    if unchecked_count:
+        logging.info(f"Unchecked Keys (rate limited): {unchecked_count}")
     logging.info(f"Validation Duration: {total_duration_seconds:.2f} seconds")
     logging.info("-" * 50)
     if results['invalid']:
         logging.warning("Invalid ISINs/Symbols found:")
         for item in results['invalid']:
-            logging.warning(f"  - {item['symbol']} ({item['isin']})")
+            logging.warning(f"  - {item.symbol} ({item.isin})")
         logging.warning("Please check these entries in your stock_list.csv")
+    if results['unchecked']:
+        logging.warning("Could not check these stocks due to API rate limiting; keeping them in the valid list:")
+        for item in results['unchecked']:
+            logging.warning(f"  - {item.symbol} ({item.isin})")
 
     # 5. Save Valid List to File
     valid_stock_list_file = config.settings['paths']['valid_stock_list_file']
-    if results['valid']:
+    # Rate-limited stocks are kept: dropping them would remove valid stocks from screening
+    stocks_to_save = results['valid'] + results['unchecked']
+    if stocks_to_save:
         try:
             with open(valid_stock_list_file, mode='w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = ['symbol', 'isin']
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-
-                writer.writeheader()
-                # Write only symbol and isin from the valid results
-                writer.writerows([{'symbol': s['symbol'], 'isin': s['isin']} for s in results['valid']])
-            logging.info(f"Saved {len(results['valid'])} valid stocks to '{valid_stock_list_file}'.")
+                writer = csv.writer(csvfile)
+                writer.writerow(Stock._fields) # Header: symbol, isin
+                writer.writerows(stocks_to_save)
+            logging.info(f"Saved {len(stocks_to_save)} valid/unchecked stocks to '{valid_stock_list_file}'.")
         except IOError as e:
             logging.error(f"Failed to save valid stock list to '{valid_stock_list_file}': {e}")
         except Exception as e:
@@ -409,7 +591,8 @@ def run_validation():
         results['invalid'],
         len(stocks),
         total_duration_seconds,
-        stocklist_webhook_url
+        stocklist_webhook_url,
+        unchecked_stocks=results['unchecked']
     )
 
     # Optionally save results to a file
@@ -432,7 +615,8 @@ if __name__ == "__main__":
          sys.exit(1)
 
     try:
-        run_validation()
+        # Pass --force to ignore the validation cache and re-check every ISIN
+        run_validation(force='--force' in sys.argv[1:])
     except KeyboardInterrupt:
         print("\nScript interrupted by user. Exiting.")
         sys.exit(1)